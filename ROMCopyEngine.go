@@ -1,7 +1,11 @@
 package main
 
 import (
+	"bufio"
+	"bytes"
+	"encoding/json"
 	"fmt"
+	"io"
 	"os"
 	"path/filepath"
 	"strings"
@@ -14,7 +18,7 @@ import (
 
 func summarizeWarnConfirm(config *cli_parsing.Config) {
 	cli_parsing.PrintCLIOpts(config)
-	fmt.Println()
+	fmt.Fprintln(logging.Writer())
 
 	if !config.SkipConfirm && !config.DryRun {
 		if config.CleanTarget {
@@ -22,7 +26,7 @@ func summarizeWarnConfirm(config *cli_parsing.Config) {
 			for _, mapping := range config.Mappings {
 				logging.Log(logging.Action, "", "• %s", filepath.Join(strings.TrimRight(config.TargetDir, "/\\"), strings.TrimLeft(mapping.Destination, "/\\")))
 			}
-			fmt.Println()
+			fmt.Fprintln(logging.Writer())
 		}
 
 		fmt.Println("[Hint: you can rerun this with '--dryRun' to see all operations that would be performed without performing them, or use '--skipConfirm' to skip this confirmation]")
@@ -34,7 +38,7 @@ func summarizeWarnConfirm(config *cli_parsing.Config) {
 		}
 	} else {
 		logging.Log(logging.Base, "", "-y passed; skipping confirmation... Let's rock!")
-		fmt.Println()
+		fmt.Fprintln(logging.Writer())
 	}
 }
 
@@ -200,7 +204,106 @@ func runPostCopyOperations(config *cli_parsing.Config, destPath string) error {
 	return nil
 }
 
+func run(config *cli_parsing.Config) error {
+	for _, mapping := range config.Mappings {
+		if err := processMapping(config, mapping); err != nil {
+			return err
+		}
+	}
+
+	if config.EmitManifest != "" {
+		if config.DryRun {
+			logging.LogDryRun(logging.Base, "", "Would have written manifest of %s to %s", config.TargetDir, config.EmitManifest)
+		} else {
+			logging.Log(logging.Base, "", "Writing manifest of %s to %s...", config.TargetDir, config.EmitManifest)
+			if err := file_operations.WriteManifest(config.TargetDir, config.EmitManifest); err != nil {
+				return err
+			}
+		}
+	}
+
+	logging.Log(logging.Base, "", "All transfers & processing completed successfully!")
+	return nil
+}
+
+// a single invocation read from stdin in server mode; args are everything after the
+// source and target directories, as they would be passed on the command line
+type serverJob struct {
+	Source string   `json:"source"`
+	Target string   `json:"target"`
+	Args   []string `json:"args"`
+}
+
+type serverResult struct {
+	Code   int    `json:"code"`
+	Stdout string `json:"stdout"`
+	Stderr string `json:"stderr"`
+}
+
+// runJob executes one server job in-process, returning the exit code the equivalent
+// command line invocation would have had
+func runJob(job serverJob, stdout io.Writer, stderr io.Writer) int {
+	logging.SetOutput(stdout)
+	defer logging.SetOutput(nil)
+
+	args := append([]string{"--sourceDir", job.Source, "--targetDir", job.Target}, job.Args...)
+	config, err := cli_parsing.ParseArgs(args, stdout, stderr)
+	if err != nil {
+		logging.LogError("Error: %v", err)
+		return 1
+	}
+
+	// there's no terminal to confirm on; a job that would prompt is an error
+	if !config.SkipConfirm && !config.DryRun {
+		logging.LogError("Error: server jobs must pass --skipConfirm or --dryRun")
+		return 1
+	}
+
+	summarizeWarnConfirm(config)
+
+	if err := run(config); err != nil {
+		logging.LogError("Error: %v", err)
+		return 1
+	}
+	return 0
+}
+
+// serve reads newline-delimited JSON jobs from in and runs them one at a time, writing a
+// JSON result line to out after each. Used by the black-box tests to avoid paying process
+// startup for every invocation.
+func serve(in io.Reader, out io.Writer) error {
+	scanner := bufio.NewScanner(in)
+	scanner.Buffer(make([]byte, 64*1024), 16*1024*1024)
+	encoder := json.NewEncoder(out)
+
+	for scanner.Scan() {
+		var job serverJob
+		var stdout, stderr bytes.Buffer
+		code := 1
+
+		if err := json.Unmarshal(scanner.Bytes(), &job); err != nil {
+			fmt.Fprintf(&stderr, "invalid job: %v\n", err)
+		} else {
+			code = runJob(job, &stdout, &stderr)
+		}
+
+		if err := encoder.Encode(serverResult{Code: code, Stdout: stdout.String(), Stderr: stderr.String()}); err != nil {
+			return fmt.Errorf("error writing job result: %w", err)
+		}
+	}
+
+	return scanner.Err()
+}
+
 func main() {
+	if len(os.Args) == 2 && os.Args[1] == "--server" {
+		if err := serve(os.Stdin, os.Stdout); err != nil {
+			fmt.Fprintf(os.Stderr, "Error: %v\n", err)
+			os.Exit(1)
+		}
+		return
+	}
+
 	intro := `   ___  ____  __  ________               ____          _
   / _ \/ __ \/  |/  / ___/__  ___  __ __/ __/__  ___ _(_)__  ___
  / , _/ /_/ / /|_/ / /__/ _ \/ _ \/ // / _// _ \/ _ '/ / _ \/ -_)
@@ -216,12 +319,8 @@ func main() {
 
 	summarizeWarnConfirm(config)
 
-	for _, mapping := range config.Mappings {
-		if err := processMapping(config, mapping); err != nil {
-			logging.LogError("Error: %v", err)
-			os.Exit(1)
-		}
+	if err := run(config); err != nil {
+		logging.LogError("Error: %v", err)
+		os.Exit(1)
 	}
-
-	logging.Log(logging.Base, "", "All transfers & processing completed successfully!")
 }
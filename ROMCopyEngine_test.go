@@ -0,0 +1,88 @@
+package main
+
+import (
+	"bytes"
+	"encoding/json"
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+)
+
+func TestServe(t *testing.T) {
+	source := t.TempDir()
+	target := t.TempDir()
+
+	for _, dir := range []string{filepath.Join(source, "snes"), filepath.Join(target, "SFC")} {
+		if err := os.MkdirAll(dir, 0755); err != nil {
+			t.Fatalf("Failed to create directory %s: %v", dir, err)
+		}
+	}
+	if err := os.WriteFile(filepath.Join(source, "snes", "game.sfc"), []byte("rom"), 0644); err != nil {
+		t.Fatalf("Failed to create source file: %v", err)
+	}
+
+	dryRunManifest := filepath.Join(t.TempDir(), "manifest.json")
+
+	jobs := []serverJob{
+		{Source: source, Target: target, Args: []string{"--mapping", "snes:SFC", "--skipConfirm"}},
+		{Source: source, Target: target, Args: []string{"--mapping", "snes:SFC"}},
+		{Source: source, Target: target, Args: []string{"--mapping", "gba:GBA", "--skipConfirm"}},
+		{Source: source, Target: target, Args: []string{"--mapping", "snes:SFC", "--dryRun", "--emitManifest", dryRunManifest}},
+	}
+
+	var in bytes.Buffer
+	for _, job := range jobs {
+		line, err := json.Marshal(job)
+		if err != nil {
+			t.Fatalf("Failed to marshal job: %v", err)
+		}
+		in.Write(append(line, '\n'))
+	}
+	in.WriteString("not json\n")
+
+	var out bytes.Buffer
+	if err := serve(&in, &out); err != nil {
+		t.Fatalf("serve() error = %v", err)
+	}
+
+	var results []serverResult
+	decoder := json.NewDecoder(&out)
+	for decoder.More() {
+		var result serverResult
+		if err := decoder.Decode(&result); err != nil {
+			t.Fatalf("Failed to decode result: %v", err)
+		}
+		results = append(results, result)
+	}
+
+	if len(results) != 5 {
+		t.Fatalf("Expected 5 results, got %d", len(results))
+	}
+
+	if results[0].Code != 0 || !strings.Contains(results[0].Stdout, "completed successfully") {
+		t.Errorf("Expected successful copy, got %+v", results[0])
+	}
+	if content, err := os.ReadFile(filepath.Join(target, "SFC", "game.sfc")); err != nil || string(content) != "rom" {
+		t.Errorf("Expected copied file, got %q (%v)", content, err)
+	}
+
+	if results[1].Code != 1 || !strings.Contains(results[1].Stdout, "--skipConfirm") {
+		t.Errorf("Expected job without --skipConfirm to be rejected, got %+v", results[1])
+	}
+
+	if results[2].Code != 1 || !strings.Contains(results[2].Stdout, "source mapping directory does not exist") {
+		t.Errorf("Expected missing mapping error, got %+v", results[2])
+	}
+
+	if results[3].Code != 0 || !strings.Contains(results[3].Stdout, "[DRY RUN] Would have written manifest") {
+		t.Errorf("Expected dry run to skip the manifest, got %+v", results[3])
+	}
+	if _, err := os.Stat(dryRunManifest); !os.IsNotExist(err) {
+		t.Errorf("Expected no manifest to be written during a dry run, got %v", err)
+	}
+
+	if results[4].Code != 1 || !strings.Contains(results[4].Stderr, "invalid job") {
+		t.Errorf("Expected invalid job error, got %+v", results[4])
+	}
+}
@@ -3,12 +3,14 @@ package cli_parsing
 import (
 	"bufio"
 	"fmt"
+	"io"
 	"os"
 	"path/filepath"
 	"regexp"
 	"strings"
 
 	"github.com/alecthomas/kong"
+	"github.com/jkingsman/ROMCopyEngine/logging"
 )
 
 type CLI struct {
@@ -26,6 +28,7 @@ type CLI struct {
 	DryRun           bool     `help:"don't execute any file copies or operations; just print what would be done" optional:"" name:"dryRun"`
 	LoopbackCopy     bool     `help:"[EXPERIMENTAL/UNSAFE] when set, any files matched by --copyInclude will have the path and extension stripped, be globbified into '**/*<filename>*', and then serve as the --copyInclude for a repeated invocation. Intended to simplify copying off a device to set a --copyInclude for '**/*.sav' or similar, then also copy the ROMs correlated with those saves. Untested; use at your own risk." optional:"" name:"loopbackCopy"`
 	SkipSummary      bool     `help:"[EXPERIMENTAL/UNSAFE] do not display a summary of operations to be performed" optional:"" name:"skipSummary"`
+	EmitManifest     string   `help:"after all mappings are processed, write a JSON manifest of every file and folder in the target directory (relative path, plus size and SHA-256 for regular files; symlinks and special files are listed by type and not followed) to the given path. Useful for verifying a copy or scripting against the result. Not written with --dryRun." optional:"" name:"emitManifest" type:"path"`
 }
 
 type Config struct {
@@ -43,6 +46,7 @@ type Config struct {
 	DryRun           bool
 	LoopbackCopy     bool
 	SkipSummary      bool
+	EmitManifest     string
 }
 
 type DirMapping struct {
@@ -78,18 +82,48 @@ func (c *Config) Validate() error {
 	return nil
 }
 
-func ParseAndValidate() (*Config, error) {
-	var cli CLI
-	ctx := kong.Parse(&cli,
+func kongOptions() []kong.Option {
+	return []kong.Option{
 		kong.Name("ROMCopyEngine"),
 		kong.Description("A tool for copying and transforming game ROM directories. See more at https://github.com/jkingsman/ROMCopyEngine."),
 		kong.UsageOnError(),
-	)
+	}
+}
+
+func ParseAndValidate() (*Config, error) {
+	var cli CLI
+	ctx := kong.Parse(&cli, kongOptions()...)
 
 	if err := ctx.Validate(); err != nil {
 		return nil, fmt.Errorf("invalid command line arguments: %w", err)
 	}
 
+	return buildConfig(&cli)
+}
+
+// ParseArgs parses and validates args like ParseAndValidate, but returns parse errors instead
+// of exiting the process, and writes any help or usage output to stdout/stderr
+func ParseArgs(args []string, stdout io.Writer, stderr io.Writer) (*Config, error) {
+	var cli CLI
+	options := append(kongOptions(), kong.Writers(stdout, stderr), kong.Exit(func(int) {}))
+	parser, err := kong.New(&cli, options...)
+	if err != nil {
+		return nil, fmt.Errorf("error building argument parser: %w", err)
+	}
+
+	ctx, err := parser.Parse(args)
+	if err != nil {
+		return nil, fmt.Errorf("invalid command line arguments: %w", err)
+	}
+
+	if err := ctx.Validate(); err != nil {
+		return nil, fmt.Errorf("invalid command line arguments: %w", err)
+	}
+
+	return buildConfig(&cli)
+}
+
+func buildConfig(cli *CLI) (*Config, error) {
 	config := &Config{
 		SourceDir:        filepath.Clean(cli.SourceDir),
 		TargetDir:        filepath.Clean(cli.TargetDir),
@@ -102,6 +136,7 @@ func ParseAndValidate() (*Config, error) {
 		DryRun:           cli.DryRun,
 		LoopbackCopy:     cli.LoopbackCopy,
 		SkipSummary:      cli.SkipSummary,
+		EmitManifest:     cli.EmitManifest,
 	}
 
 	// Validate source directory exists
@@ -176,78 +211,83 @@ func PrintCLIOpts(config *Config) {
 		return
 	}
 
-	fmt.Println()
-	fmt.Println("==== Configuration ====")
-	fmt.Println()
+	w := logging.Writer()
+	fmt.Fprintln(w)
+	fmt.Fprintln(w, "==== Configuration ====")
+	fmt.Fprintln(w)
 
-	fmt.Printf("Copy sources and destinations:\n")
+	fmt.Fprintf(w, "Copy sources and destinations:\n")
 	for _, m := range config.Mappings {
-		fmt.Printf("  %s -> %s\n", filepath.Join(config.SourceDir, m.Source), filepath.Join(config.TargetDir, m.Destination))
+		fmt.Fprintf(w, "  %s -> %s\n", filepath.Join(config.SourceDir, m.Source), filepath.Join(config.TargetDir, m.Destination))
 	}
 
 	if len(config.Renames) > 0 {
-		fmt.Printf("Renames:\n")
+		fmt.Fprintf(w, "Renames:\n")
 		for _, r := range config.Renames {
-			fmt.Printf("  • All files named %s will be renamed to %s\n", r.OldName, r.NewName)
+			fmt.Fprintf(w, "  • All files named %s will be renamed to %s\n", r.OldName, r.NewName)
 		}
 	}
 
 	if len(config.ExplodeDirs) > 0 {
-		fmt.Printf("Exploded directories:\n")
+		fmt.Fprintf(w, "Exploded directories:\n")
 		for _, e := range config.ExplodeDirs {
-			fmt.Printf("  • All directories named %s will have their contents copied to the parent platform folder\n", e)
+			fmt.Fprintf(w, "  • All directories named %s will have their contents copied to the parent platform folder\n", e)
 		}
 	}
 
 	if len(config.FileRewrites) > 0 {
 		if config.RewritesAreRegex {
-			fmt.Println("Regex file rewrites:")
+			fmt.Fprintln(w, "Regex file rewrites:")
 		} else {
-			fmt.Println("Literal file rewrites:")
+			fmt.Fprintln(w, "Literal file rewrites:")
 		}
 
-		fmt.Printf("Rewrites:\n")
+		fmt.Fprintf(w, "Rewrites:\n")
 		for _, r := range config.FileRewrites {
-			fmt.Printf("  • All files matching glob '%s' will have %s replaced with %s\n", r.FileGlob, r.SearchPattern, r.ReplacePattern)
+			fmt.Fprintf(w, "  • All files matching glob '%s' will have %s replaced with %s\n", r.FileGlob, r.SearchPattern, r.ReplacePattern)
 		}
 	}
 
 	if len(config.CopyInclude) > 0 || len(config.CopyExclude) > 0 {
-		fmt.Println("Copies:")
+		fmt.Fprintln(w, "Copies:")
 	}
 	if len(config.CopyInclude) > 0 {
-		fmt.Println("• Copy will include files/folders matching any of:")
+		fmt.Fprintln(w, "• Copy will include files/folders matching any of:")
 		for _, c := range config.CopyInclude {
-			fmt.Printf("  • %s\n", c)
+			fmt.Fprintf(w, "  • %s\n", c)
 		}
 	}
 
 	if len(config.CopyExclude) > 0 {
-		fmt.Println("• Copy will exclude files/folders matching any of:")
+		fmt.Fprintln(w, "• Copy will exclude files/folders matching any of:")
 		for _, c := range config.CopyExclude {
-			fmt.Printf("  • %s\n", c)
+			fmt.Fprintf(w, "  • %s\n", c)
 		}
 	}
 
 	if config.CleanTarget {
-		fmt.Println("Target directory will be cleaned before copying")
+		fmt.Fprintln(w, "Target directory will be cleaned before copying")
 	}
 
 	if config.DryRun {
-		fmt.Println("Dry run mode enabled; no files will be copied or modified")
+		fmt.Fprintln(w, "Dry run mode enabled; no files will be copied or modified")
 	}
 
 	if config.SkipConfirm {
-		fmt.Println("Skip-confirm enabled; no warnings given before proceeding")
+		fmt.Fprintln(w, "Skip-confirm enabled; no warnings given before proceeding")
 	}
 
 	if config.LoopbackCopy {
-		fmt.Println("Loopback mode enabled; copy will be run a second time, globbing to match filename of previously matched files")
+		fmt.Fprintln(w, "Loopback mode enabled; copy will be run a second time, globbing to match filename of previously matched files")
+	}
+
+	if config.EmitManifest != "" && !config.DryRun {
+		fmt.Fprintf(w, "A manifest of the target directory will be written to %s\n", config.EmitManifest)
 	}
 
-	fmt.Println()
+	fmt.Fprintln(w)
 
-	fmt.Printf("==== End Configuration ====\n")
+	fmt.Fprintf(w, "==== End Configuration ====\n")
 }
 
 func GetConfirmation(prompt string) bool {
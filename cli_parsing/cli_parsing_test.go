@@ -1,6 +1,7 @@
 package cli_parsing
 
 import (
+	"bytes"
 	"os"
 	"path/filepath"
 	"testing"
@@ -237,6 +238,60 @@ func TestParseAndValidate(t *testing.T) {
 	}
 }
 
+func TestParseArgs(t *testing.T) {
+	tmpSource := t.TempDir()
+	tmpTarget := t.TempDir()
+
+	if err := os.MkdirAll(filepath.Join(tmpSource, "nes"), 0755); err != nil {
+		t.Fatalf("Failed to create test directory: %v", err)
+	}
+
+	tests := []struct {
+		name      string
+		args      []string
+		wantError bool
+	}{
+		{
+			name:      "valid config",
+			args:      []string{"--sourceDir", tmpSource, "--targetDir", tmpTarget, "--mapping", "nes:NES", "--skipConfirm"},
+			wantError: false,
+		},
+		{
+			name:      "unknown flag",
+			args:      []string{"--sourceDir", tmpSource, "--targetDir", tmpTarget, "--mapping", "nes:NES", "--bogus"},
+			wantError: true,
+		},
+		{
+			name:      "missing required flag",
+			args:      []string{"--sourceDir", tmpSource, "--targetDir", tmpTarget},
+			wantError: true,
+		},
+		{
+			name:      "missing source mapping directory",
+			args:      []string{"--sourceDir", tmpSource, "--targetDir", tmpTarget, "--mapping", "snes:SFC"},
+			wantError: true,
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			var stdout, stderr bytes.Buffer
+
+			// parse errors must come back as errors rather than exiting the test binary
+			config, err := ParseArgs(tt.args, &stdout, &stderr)
+
+			if (err != nil) != tt.wantError {
+				t.Errorf("ParseArgs() error = %v, wantError %v", err, tt.wantError)
+				return
+			}
+
+			if !tt.wantError && (!config.SkipConfirm || len(config.Mappings) != 1) {
+				t.Errorf("Unexpected config: %+v", config)
+			}
+		})
+	}
+}
+
 func TestGetConfirmation(t *testing.T) {
 	tests := []struct {
 		name     string
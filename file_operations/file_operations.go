@@ -1,8 +1,12 @@
 package file_operations
 
 import (
+	"crypto/sha256"
+	"encoding/hex"
+	"encoding/json"
 	"fmt"
 	"io"
+	"io/fs"
 	"os"
 	"path/filepath"
 	"regexp"
@@ -209,3 +213,96 @@ func SearchAndReplace(path string, glob string, searchTerm string, replaceTerm s
 
 	return true, nil
 }
+
+// Manifest operations
+type ManifestEntry struct {
+	Path   string `json:"path"`
+	IsDir  bool   `json:"is_dir,omitempty"`
+	Size   int64  `json:"size,omitempty"`
+	SHA256 string `json:"sha256,omitempty"`
+	Type   string `json:"type,omitempty"`
+}
+
+// writes a JSON list of every file and folder under rootPath (paths relative to rootPath, slash separated)
+// to manifestPath; regular files carry their size and SHA-256, while symlinks and other special files are
+// listed with their type ("symlink" or "other") and never opened
+func WriteManifest(rootPath string, manifestPath string) error {
+	absManifest, err := filepath.Abs(manifestPath)
+	if err != nil {
+		return fmt.Errorf("failed to get absolute manifest path: %w", err)
+	}
+
+	entries := make([]ManifestEntry, 0)
+	err = filepath.WalkDir(rootPath, func(path string, d fs.DirEntry, err error) error {
+		if err != nil {
+			return fmt.Errorf("error accessing path %s: %w", path, err)
+		}
+
+		relPath, err := filepath.Rel(rootPath, path)
+		if err != nil {
+			return fmt.Errorf("failed to get relative path for %s: %w", path, err)
+		}
+
+		if relPath == "." {
+			return nil
+		}
+
+		if d.IsDir() {
+			entries = append(entries, ManifestEntry{Path: filepath.ToSlash(relPath), IsDir: true})
+			return nil
+		}
+
+		// Don't list a stale manifest from a previous run
+		if absPath, err := filepath.Abs(path); err == nil && absPath == absManifest {
+			return nil
+		}
+
+		if d.Type()&fs.ModeSymlink != 0 {
+			entries = append(entries, ManifestEntry{Path: filepath.ToSlash(relPath), Type: "symlink"})
+			return nil
+		}
+
+		if !d.Type().IsRegular() {
+			entries = append(entries, ManifestEntry{Path: filepath.ToSlash(relPath), Type: "other"})
+			return nil
+		}
+
+		size, sum, err := hashFile(path)
+		if err != nil {
+			return err
+		}
+
+		entries = append(entries, ManifestEntry{Path: filepath.ToSlash(relPath), Size: size, SHA256: sum})
+		return nil
+	})
+	if err != nil {
+		return err
+	}
+
+	content, err := json.Marshal(entries)
+	if err != nil {
+		return fmt.Errorf("failed to encode manifest: %w", err)
+	}
+
+	if err := os.WriteFile(manifestPath, content, 0644); err != nil {
+		return fmt.Errorf("failed to write manifest %s: %w", manifestPath, err)
+	}
+
+	return nil
+}
+
+func hashFile(path string) (int64, string, error) {
+	file, err := os.Open(path)
+	if err != nil {
+		return 0, "", fmt.Errorf("failed to open file %s: %w", path, err)
+	}
+	defer file.Close()
+
+	hash := sha256.New()
+	size, err := io.Copy(hash, file)
+	if err != nil {
+		return 0, "", fmt.Errorf("failed to hash file %s: %w", path, err)
+	}
+
+	return size, hex.EncodeToString(hash.Sum(nil)), nil
+}
@@ -0,0 +1,162 @@
+package file_operations
+
+import (
+	"encoding/json"
+	"os"
+	"path/filepath"
+	"testing"
+)
+
+func TestWriteManifest(t *testing.T) {
+	tmpDir, cleanup := testSetup(t)
+	defer cleanup()
+
+	rootDir := filepath.Join(tmpDir, "root")
+	files := map[string]string{
+		"game.bin":          "",
+		"gamelist.xml":      "<xml>foo</xml>",
+		"images/game.png":   "png",
+		"nested/deep/a.txt": "a",
+	}
+	if err := createTestDir(rootDir, files); err != nil {
+		t.Fatalf("Failed to create test structure: %v", err)
+	}
+	if err := os.MkdirAll(filepath.Join(rootDir, "empty"), 0755); err != nil {
+		t.Fatalf("Failed to create empty directory: %v", err)
+	}
+
+	manifestPath := filepath.Join(tmpDir, "manifest.json")
+	if err := WriteManifest(rootDir, manifestPath); err != nil {
+		t.Fatalf("WriteManifest() error = %v", err)
+	}
+
+	content, err := os.ReadFile(manifestPath)
+	if err != nil {
+		t.Fatalf("Failed to read manifest: %v", err)
+	}
+
+	var entries []ManifestEntry
+	if err := json.Unmarshal(content, &entries); err != nil {
+		t.Fatalf("Failed to parse manifest: %v", err)
+	}
+
+	expected := map[string]ManifestEntry{
+		"empty":             {Path: "empty", IsDir: true},
+		"game.bin":          {Path: "game.bin", SHA256: "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"},
+		"gamelist.xml":      {Path: "gamelist.xml", Size: 14, SHA256: "3fd94de06bc90cbf8bbc8126b58420d516d2f83afb0dfe18eb3e7baffe3005b5"},
+		"images":            {Path: "images", IsDir: true},
+		"images/game.png":   {Path: "images/game.png", Size: 3, SHA256: "8f8cbb7dcf46e0bc7d53265749a6c17d116093a6ba95e442764060c76fd4a86c"},
+		"nested":            {Path: "nested", IsDir: true},
+		"nested/deep":       {Path: "nested/deep", IsDir: true},
+		"nested/deep/a.txt": {Path: "nested/deep/a.txt", Size: 1, SHA256: "ca978112ca1bbdcafac231b39a23dc4da786eff8147c4e72b9807785afee48bb"},
+	}
+
+	if len(entries) != len(expected) {
+		t.Errorf("Expected %d manifest entries, got %d: %v", len(expected), len(entries), entries)
+	}
+
+	for _, entry := range entries {
+		want, ok := expected[entry.Path]
+		if !ok {
+			t.Errorf("Unexpected manifest entry: %v", entry)
+			continue
+		}
+		if entry != want {
+			t.Errorf("Manifest entry for %s = %v, want %v", entry.Path, entry, want)
+		}
+	}
+}
+
+func TestWriteManifest_SkipsManifestInsideRoot(t *testing.T) {
+	tmpDir, cleanup := testSetup(t)
+	defer cleanup()
+
+	if err := createTestDir(tmpDir, map[string]string{"game.bin": "rom"}); err != nil {
+		t.Fatalf("Failed to create test structure: %v", err)
+	}
+
+	manifestPath := filepath.Join(tmpDir, "manifest.json")
+	for i := 0; i < 2; i++ {
+		if err := WriteManifest(tmpDir, manifestPath); err != nil {
+			t.Fatalf("WriteManifest() error = %v", err)
+		}
+	}
+
+	content, err := os.ReadFile(manifestPath)
+	if err != nil {
+		t.Fatalf("Failed to read manifest: %v", err)
+	}
+
+	var entries []ManifestEntry
+	if err := json.Unmarshal(content, &entries); err != nil {
+		t.Fatalf("Failed to parse manifest: %v", err)
+	}
+
+	if len(entries) != 1 || entries[0].Path != "game.bin" {
+		t.Errorf("Expected only game.bin in manifest, got %v", entries)
+	}
+}
+
+func TestWriteManifest_Symlinks(t *testing.T) {
+	tmpDir, cleanup := testSetup(t)
+	defer cleanup()
+
+	rootDir := filepath.Join(tmpDir, "root")
+	if err := createTestDir(rootDir, map[string]string{"game.bin": "rom", "saves/a.srm": "srm"}); err != nil {
+		t.Fatalf("Failed to create test structure: %v", err)
+	}
+	if err := os.Symlink(filepath.Join(tmpDir, "missing"), filepath.Join(rootDir, "dangling")); err != nil {
+		t.Skipf("Symlinks not supported: %v", err)
+	}
+	if err := os.Symlink("saves", filepath.Join(rootDir, "saves-link")); err != nil {
+		t.Fatalf("Failed to create directory symlink: %v", err)
+	}
+
+	manifestPath := filepath.Join(tmpDir, "manifest.json")
+	if err := WriteManifest(rootDir, manifestPath); err != nil {
+		t.Fatalf("WriteManifest() error = %v", err)
+	}
+
+	content, err := os.ReadFile(manifestPath)
+	if err != nil {
+		t.Fatalf("Failed to read manifest: %v", err)
+	}
+
+	var entries []ManifestEntry
+	if err := json.Unmarshal(content, &entries); err != nil {
+		t.Fatalf("Failed to parse manifest: %v", err)
+	}
+
+	expected := map[string]ManifestEntry{
+		"dangling":    {Path: "dangling", Type: "symlink"},
+		"game.bin":    {Path: "game.bin", Size: 3, SHA256: "1a0806c20104d3461d8ede70362f16734dbd6a17db24005d1841a7387c9b2405"},
+		"saves":       {Path: "saves", IsDir: true},
+		"saves-link":  {Path: "saves-link", Type: "symlink"},
+		"saves/a.srm": {Path: "saves/a.srm", Size: 3, SHA256: "599dcccca11a5a4a16184c8d5387ff0adccf26770b17132325bf06e7818b99fa"},
+	}
+
+	if len(entries) != len(expected) {
+		t.Errorf("Expected %d manifest entries, got %d: %v", len(expected), len(entries), entries)
+	}
+
+	for _, entry := range entries {
+		want, ok := expected[entry.Path]
+		if !ok {
+			t.Errorf("Unexpected manifest entry: %v", entry)
+			continue
+		}
+		if entry != want {
+			t.Errorf("Manifest entry for %s = %v, want %v", entry.Path, entry, want)
+		}
+	}
+}
+
+func TestWriteManifest_MissingRoot(t *testing.T) {
+	tmpDir, cleanup := testSetup(t)
+	defer cleanup()
+
+	err := WriteManifest(filepath.Join(tmpDir, "nonexistent"), filepath.Join(tmpDir, "manifest.json"))
+	if err == nil {
+		t.Error("Expected error for missing root directory")
+	}
+}
@@ -0,0 +1,45 @@
+//go:build unix
+
+package file_operations
+
+import (
+	"encoding/json"
+	"os"
+	"path/filepath"
+	"syscall"
+	"testing"
+)
+
+func TestWriteManifest_FIFO(t *testing.T) {
+	tmpDir, cleanup := testSetup(t)
+	defer cleanup()
+
+	rootDir := filepath.Join(tmpDir, "root")
+	if err := os.MkdirAll(rootDir, 0755); err != nil {
+		t.Fatalf("Failed to create root directory: %v", err)
+	}
+	if err := syscall.Mkfifo(filepath.Join(rootDir, "pipe"), 0644); err != nil {
+		t.Fatalf("Failed to create FIFO: %v", err)
+	}
+
+	// Opening the FIFO would block forever, so this only returns if it's left alone
+	manifestPath := filepath.Join(tmpDir, "manifest.json")
+	if err := WriteManifest(rootDir, manifestPath); err != nil {
+		t.Fatalf("WriteManifest() error = %v", err)
+	}
+
+	content, err := os.ReadFile(manifestPath)
+	if err != nil {
+		t.Fatalf("Failed to read manifest: %v", err)
+	}
+
+	var entries []ManifestEntry
+	if err := json.Unmarshal(content, &entries); err != nil {
+		t.Fatalf("Failed to parse manifest: %v", err)
+	}
+
+	want := ManifestEntry{Path: "pipe", Type: "other"}
+	if len(entries) != 1 || entries[0] != want {
+		t.Errorf("Expected only %v in manifest, got %v", want, entries)
+	}
+}
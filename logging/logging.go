@@ -1,6 +1,10 @@
 package logging
 
-import "fmt"
+import (
+	"fmt"
+	"io"
+	"os"
+)
 
 // log level == indentation
 type LogLevel int
@@ -29,6 +33,22 @@ const (
 	IconError    = "❌"
 )
 
+// destination for all log output; nil means stdout
+var output io.Writer
+
+// redirect all log output to w; nil restores stdout
+func SetOutput(w io.Writer) {
+	output = w
+}
+
+// the writer log output currently goes to
+func Writer() io.Writer {
+	if output == nil {
+		return os.Stdout
+	}
+	return output
+}
+
 func getIndentation(level LogLevel) string {
 	switch level {
 	case Action:
@@ -44,9 +64,9 @@ func getIndentation(level LogLevel) string {
 func Log(level LogLevel, icon, message string, args ...interface{}) {
 	indent := getIndentation(level)
 	if icon != "" {
-		fmt.Printf("%s%s %s\n", indent, icon, fmt.Sprintf(message, args...))
+		fmt.Fprintf(Writer(), "%s%s %s\n", indent, icon, fmt.Sprintf(message, args...))
 	} else {
-		fmt.Printf("%s%s\n", indent, fmt.Sprintf(message, args...))
+		fmt.Fprintf(Writer(), "%s%s\n", indent, fmt.Sprintf(message, args...))
 	}
 }
 
@@ -54,20 +74,20 @@ func Log(level LogLevel, icon, message string, args ...interface{}) {
 func LogDryRun(level LogLevel, icon, message string, args ...interface{}) {
 	indent := getIndentation(level)
 	if icon != "" {
-		fmt.Printf("%s%s [DRY RUN] %s\n", indent, icon, fmt.Sprintf(message, args...))
+		fmt.Fprintf(Writer(), "%s%s [DRY RUN] %s\n", indent, icon, fmt.Sprintf(message, args...))
 	} else {
-		fmt.Printf("%s[DRY RUN] %s\n", indent, fmt.Sprintf(message, args...))
+		fmt.Fprintf(Writer(), "%s[DRY RUN] %s\n", indent, fmt.Sprintf(message, args...))
 	}
 }
 
 func LogWarning(message string, args ...interface{}) {
-	fmt.Printf("%s WARNING %s\n", IconWarning, fmt.Sprintf(message, args...))
+	fmt.Fprintf(Writer(), "%s WARNING %s\n", IconWarning, fmt.Sprintf(message, args...))
 }
 
 func LogComplete(message string) {
-	fmt.Printf("%s%s complete!\n", getIndentation(Action), message)
+	fmt.Fprintf(Writer(), "%s%s complete!\n", getIndentation(Action), message)
 }
 
 func LogError(message string, args ...interface{}) {
-	fmt.Printf("%s %s\n", IconError, fmt.Sprintf(message, args...))
+	fmt.Fprintf(Writer(), "%s %s\n", IconError, fmt.Sprintf(message, args...))
 }
@@ -164,6 +164,30 @@ func TestLogError(t *testing.T) {
 	}
 }
 
+func TestSetOutput(t *testing.T) {
+	var buf bytes.Buffer
+	SetOutput(&buf)
+
+	stdout := captureOutput(func() {
+		Log(Action, IconCopy, "Copying %s", "test.txt")
+		LogError("Error occurred: %s", "test error")
+	})
+
+	SetOutput(nil)
+
+	expected := "  📋 Copying test.txt\n❌ Error occurred: test error\n"
+	if buf.String() != expected {
+		t.Errorf("SetOutput() output = %q, want %q", buf.String(), expected)
+	}
+	if stdout != "" {
+		t.Errorf("Expected nothing on stdout while redirected, got %q", stdout)
+	}
+
+	if Writer() != os.Stdout {
+		t.Error("Writer() should be stdout after SetOutput(nil)")
+	}
+}
+
 func TestIconConstants(t *testing.T) {
 	// Test that all icon constants are non-empty and unique
 	icons := map[string]string{
@@ -0,0 +1,29 @@
+"""pytest hooks for running the black-box suite in parallel with pytest-xdist.
+
+Resolve the (cached) engine binary once in the controller process and hand it to
+every worker via ROMCOPYENGINE_BIN, so workers don't each hash or rebuild it:
+
+    pytest -n auto testing/test_blackbox.py
+"""
+
+import os
+
+from test_blackbox import build_rom_copy_engine
+
+_exported = False
+
+
+def pytest_configure(config):
+    global _exported
+
+    # xdist workers inherit the controller's environment
+    if hasattr(config, "workerinput") or "ROMCOPYENGINE_BIN" in os.environ:
+        return
+
+    os.environ["ROMCOPYENGINE_BIN"] = build_rom_copy_engine()
+    _exported = True
+
+
+def pytest_unconfigure(config):
+    if _exported:
+        os.environ.pop("ROMCOPYENGINE_BIN", None)
@@ -1,134 +1,666 @@
 #!/usr/bin/env python3
 
 import os
+import hashlib
 import tempfile
+import shlex
 import shutil
 import subprocess
+import sys
 import json
+import threading
 import unittest
-from typing import List, Dict, Any
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass
-import difflib
+from operator import attrgetter
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; clone_file falls back to copying
+    fcntl = None
 
 
 PRINT_CREATION_AND_COMMAND = False
 
-@dataclass
+# Linux ioctl to share a file's extents with another file (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@dataclass(frozen=True)
 class FileStructure:
     path: str
     contents: str = ""
     is_dir: bool = False
 
 
+Structure = Sequence[FileStructure]
+
+
 @dataclass
 class TestFixture:
     """Test fixture for ROMCopyEngine tests containing source, destination and expected structures."""
-    source_struct: List[Dict[str, Any]]
-    dest_struct: List[Dict[str, Any]]
-    expected_struct: List[Dict[str, Any]]
-    options: str = ""
+    source_struct: Structure
+    dest_struct: Structure
+    expected_struct: Structure
+    options: Tuple[str, ...] = ()
 
 def print_debug(statement: str):
     if PRINT_CREATION_AND_COMMAND:
         print(statement)
 
+def clone_file(src: str, dst: str) -> str:
+    """copytree copy_function that reflinks files where the filesystem allows it.
+
+    Cloning is O(1) and shares the data blocks; after the first filesystem that
+    refuses (e.g. tmpfs, ext4) we stop trying and just copy.
+    """
+    global reflink_supported
+    if fcntl is not None and reflink_supported:
+        try:
+            with open(src, "rb") as source, open(dst, "wb") as dest:
+                fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            reflink_supported = False
+    return shutil.copy2(src, dst)
+
+reflink_supported = sys.platform == "linux"
+
+def link_file(src: str, dst: str) -> str:
+    """copytree copy_function that hardlinks files, for trees nothing will write to.
+
+    A link is a single syscall with no data written; if the filesystem refuses
+    (e.g. across devices), fall back to clone_file.
+    """
+    try:
+        os.link(src, dst)
+        return dst
+    except OSError:
+        return clone_file(src, dst)
+
+def find_temp_root() -> Optional[str]:
+    """Pick a RAM-backed directory for test trees, or None for the system default.
+
+    ROMCOPYENGINE_TMPFS overrides the choice; otherwise /dev/shm is used when it's writable.
+    """
+    root = os.environ.get("ROMCOPYENGINE_TMPFS")
+    if root:
+        return root
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None
+
+TEMP_ROOT = find_temp_root()
+
+# Flags the engine binary is built with; part of the cache key
+GO_BUILD_FLAGS = ("-trimpath", "-ldflags=-s -w")
+# Toolchain and environment settings that change the binary without touching the sources
+GO_ENV_VARS = ("GOVERSION", "GOOS", "GOARCH", "CGO_ENABLED", "GOFLAGS")
+
+
+def engine_source_hash() -> str:
+    """Hash everything that goes into the engine binary: Go sources, go.mod/go.sum,
+    build flags and the toolchain settings in GO_ENV_VARS."""
+    toolchain = subprocess.run(
+        ["go", "env", *GO_ENV_VARS], capture_output=True, text=True, cwd=REPO_ROOT
+    )
+    if toolchain.returncode != 0:
+        raise RuntimeError(f"Failed to query the Go toolchain:\n{toolchain.stderr}")
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\0".join(GO_BUILD_FLAGS).encode())
+    digest.update(toolchain.stdout.encode())
+
+    paths = []
+    for root, dirs, files in os.walk(REPO_ROOT):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d != "testing"]
+        paths.extend(
+            os.path.join(root, name)
+            for name in files
+            if name in ("go.mod", "go.sum") or (name.endswith(".go") and not name.endswith("_test.go"))
+        )
+
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, REPO_ROOT).encode() + b"\0")
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def build_rom_copy_engine() -> str:
+    """Return the path to a ROMCopyEngine binary built from the current sources.
+
+    Binaries are cached in $XDG_CACHE_HOME/romcopy (~/.cache/romcopy by default) under
+    a hash of their sources and toolchain, so the engine is only recompiled when
+    something changed.
+
+    When ROMCOPYENGINE_TMPFS is set and GOCACHE isn't, Go's build cache is kept
+    there too. It isn't moved by default: a RAM-backed cache starts cold after
+    every reboot, while the default on-disk one stays warm.
+    """
+    cache_dir = os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "romcopy"
+    )
+    binary = os.path.join(cache_dir, f"bin-{engine_source_hash()}")
+    if os.path.exists(binary):
+        return binary
+
+    env = None
+    tmpfs = os.environ.get("ROMCOPYENGINE_TMPFS")
+    if tmpfs and "GOCACHE" not in os.environ:
+        env = {**os.environ, "GOCACHE": os.path.abspath(os.path.join(tmpfs, "romcopyengine-gocache"))}
+
+    # Build under a unique name and move it into place, so concurrent runs never
+    # see (or execute) a half-written binary
+    os.makedirs(cache_dir, exist_ok=True)
+    partial = f"{binary}.{uuid.uuid4().hex}.tmp"
+    build = subprocess.run(
+        ["go", "build", *GO_BUILD_FLAGS, "-o", partial, "ROMCopyEngine.go"],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        env=env,
+    )
+    if build.returncode != 0:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise RuntimeError(f"Failed to build ROMCopyEngine:\n{build.stderr}")
+    os.replace(partial, binary)
+    return binary
+
+class BufferedResult:
+    """Stand-in TestResult for one test running on a worker thread.
+
+    The test's reporting calls (startTest, add*, stopTest) are recorded and replayed
+    into the real result together when it finishes, under a lock shared by all
+    workers, so concurrent tests never interleave their output (e.g. the
+    "test_x ... ok" lines under -v). Everything else is read straight from the real
+    result, so shouldStop, failfast etc. stay live.
+    """
+
+    def __init__(self, result: unittest.TestResult, lock: threading.Lock):
+        self._result = result
+        self._lock = lock
+        self._calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._result, name)
+        if not callable(attr) or not (name.startswith("add") or name in ("startTest", "stopTest")):
+            return attr
+
+        def record(*args, **kwargs):
+            self._calls.append((attr, args, kwargs))
+            if name == "stopTest":
+                with self._lock:
+                    for call, call_args, call_kwargs in self._calls:
+                        call(*call_args, **call_kwargs)
+                self._calls.clear()
+
+        return record
+
+
+class ConcurrentTestSuite(unittest.TestSuite):
+    """Run every contained test on a thread pool.
+
+    The black-box tests are isolated from each other and spend nearly all of their
+    time waiting on the engine, so threads overlap them well. Tests are run one class
+    at a time; module and class fixtures around each batch go through TestSuite's own
+    handling, so a failing setUpClass/tearDownClass is reported as an error on the
+    result and class cleanups still run.
+
+    Output buffering (-b/--buffer) swaps sys.stdout and sys.stderr for the whole
+    process around each test, which threads can't share, so a buffered run executes
+    its tests one at a time instead.
+
+    The fixture handling relies on TestSuite's private hooks (_handleModuleFixture,
+    _handleClassSetUp, _tearDownPreviousClass, _handleModuleTearDown) and the
+    result's _testRunEntered/_previousTestClass attributes. Those were checked
+    against CPython 3.11 and have the same names and signatures from 3.8 through
+    3.13; recheck them when moving to a newer Python.
+    """
+
+    def run(self, result, debug=False):
+        tests = []
+
+        def flatten(suite):
+            for test in suite:
+                if isinstance(test, unittest.TestSuite):
+                    flatten(test)
+                else:
+                    tests.append(test)
+
+        flatten(self)
+        batches = {}
+        for test in tests:
+            batches.setdefault(type(test), []).append(test)
+
+        top_level = False
+        if getattr(result, "_testRunEntered", False) is False:
+            result._testRunEntered = top_level = True
+
+        lock = threading.Lock()
+        try:
+            for batch in batches.values():
+                if result.shouldStop:
+                    break
+
+                first = batch[0]
+                self._tearDownPreviousClass(first, result)
+                self._handleModuleFixture(first, result)
+                self._handleClassSetUp(first, result)
+                result._previousTestClass = first.__class__
+                if getattr(first.__class__, "_classSetupFailed", False) or getattr(
+                    result, "_moduleSetUpFailed", False
+                ):
+                    continue
+
+                if debug:
+                    for test in batch:
+                        test.debug()
+                elif getattr(result, "buffer", False):
+                    for test in batch:
+                        if result.shouldStop:
+                            break
+                        test(result)
+                else:
+                    self.run_batch(batch, result, lock)
+        finally:
+            if top_level:
+                self._tearDownPreviousClass(None, result)
+                self._handleModuleTearDown(result)
+                result._testRunEntered = False
+
+        return result
+
+    @staticmethod
+    def run_batch(tests: List[unittest.TestCase], result: unittest.TestResult, lock: threading.Lock) -> None:
+        """Run tests concurrently, no longer starting new ones once the result says to stop."""
+
+        def run_test(test):
+            # Set by failfast (-f) and by Ctrl-C when unittest is catching breaks (-c)
+            if not result.shouldStop:
+                test(BufferedResult(result, lock))
+
+        pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        try:
+            for future in [pool.submit(run_test, test) for test in tests]:
+                future.result()
+        except BaseException:
+            # e.g. an uncaught Ctrl-C: let running tests finish, but don't start queued ones
+            result.stop()
+            raise
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# Common test structures, shared (never mutated) between tests
+SNES_SOURCE_STRUCTURE = (
+    FileStructure("snes/file1.snes"),
+    FileStructure("snes/file2.snes"),
+    FileStructure("snes/nested_dir/image.png"),
+    FileStructure("snes/file.xml", contents="<xml>foo</xml>"),
+    FileStructure("nes", is_dir=True),
+)
+
+BASIC_SOURCE_STRUCTURE = SNES_SOURCE_STRUCTURE + (
+    FileStructure("psx/game1.bin"),
+    FileStructure("psx/game2.bin"),
+    FileStructure("psx/multidisk/game3_disk1.bin"),
+    FileStructure("psx/multidisk/game3_disk2.bin"),
+    FileStructure(
+        "psx/multidisk/game3.m3u",
+        contents="./multidisk/game3_disk1.bin\n./multidisk/game3_disk2.bin",
+    ),
+    FileStructure("psx/images/game1.png"),
+    FileStructure("psx/images/game2.png"),
+    FileStructure(
+        "psx/gameslist.xml",
+        contents="<game>\n  <path>game1.bin</path>\n  <image>../psx/images/game1.png</image>\n</game>",
+    ),
+)
+
+SNES_DESTINATION = (FileStructure("snes", is_dir=True),)
+PS1_DESTINATION = (FileStructure("PS1", is_dir=True),)
+EMPTY_DESTINATION = SNES_DESTINATION + PS1_DESTINATION
+
+SNES_COPY_EXPECTED = (
+    FileStructure("snes", is_dir=True),
+    FileStructure("snes/file1.snes"),
+    FileStructure("snes/file2.snes"),
+    FileStructure("snes/file.xml", contents="<xml>foo</xml>"),
+    FileStructure("snes/nested_dir", is_dir=True),
+    FileStructure("snes/nested_dir/image.png"),
+)
+
+
 class ROMCopyEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Get a ROMCopyEngine binary (building it if the cached one is stale) for the whole test class.
+
+        If ROMCOPYENGINE_BIN is set (e.g. by conftest.py when running under
+        pytest-xdist), that prebuilt binary is used instead.
+        """
+        # Resolve the binary before creating anything, so a failed build leaves nothing
+        # behind (tearDownClass doesn't run when setUpClass raises)
+        cls._bin = os.environ.get("ROMCOPYENGINE_BIN") or build_rom_copy_engine()
+
+        cls._cleanup_pool = ThreadPoolExecutor(max_workers=4)
+        cls._cleanups = []
+        cls._template_dir = tempfile.mkdtemp(dir=TEMP_ROOT)
+        cls._templates = {}
+        cls._template_lock = threading.Lock()
+        cls._manifest_dir = tempfile.mkdtemp(dir=TEMP_ROOT)
+        cls._servers = []
+        cls._server_lock = threading.Lock()
+        cls._local = threading.local()
+        cls._destinations = []
+        cls._destination_lock = threading.Lock()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop engine servers, then remove reusable destinations, templates and manifests.
+
+        Every folder goes through the same background removal as the per-test ones. Any
+        that couldn't be removed fail tearDownClass, which the runner reports as an
+        error alongside the test results rather than leaving them silently behind.
+        """
+        cls.stop_servers()
+        for folder in (*cls._destinations, cls._template_dir, cls._manifest_dir):
+            cls.discard_folder(folder)
+        cls._cleanup_pool.shutdown(wait=True)
+
+        errors = [cleanup.exception() for cleanup in cls._cleanups if cleanup.exception()]
+        if errors:
+            raise RuntimeError(
+                f"Failed to remove {len(errors)} test folder(s):\n"
+                + "\n".join(f"  {error}" for error in errors)
+            )
+
+    @classmethod
+    def engine_server(cls) -> subprocess.Popen:
+        """Return this thread's long-lived `--server` engine process, starting it on first use.
+
+        Each worker thread gets its own server, so jobs from concurrent tests never
+        queue up behind each other (or share the engine's log output).
+        """
+        server = getattr(cls._local, "server", None)
+        if server is None or server.poll() is not None:
+            server = subprocess.Popen(
+                [cls._bin, "--server"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                cwd=REPO_ROOT,
+            )
+            cls._local.server = server
+            with cls._server_lock:
+                cls._servers.append(server)
+        return server
+
+    @classmethod
+    def stop_servers(cls) -> None:
+        """Close every engine server's stdin and wait for it to exit."""
+        with cls._server_lock:
+            servers, cls._servers = cls._servers, []
+        for server in servers:
+            try:
+                server.stdin.close()
+                server.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                server.kill()
+                server.wait()
+            server.stdout.close()
+
     def setUp(self):
         """Create temporary directories for each test."""
         self.source_temp_folder, self.destination_temp_folder = (
             self.create_temp_folders()
         )
+        # The destination folder is reused, so name manifests per test instead
+        self.manifest_path = os.path.join(self._manifest_dir, f"{uuid.uuid4().hex}.json")
 
-    def tearDown(self):
-        """Clean up temporary directories after each test."""
-        shutil.rmtree(self.source_temp_folder, ignore_errors=True)
-        shutil.rmtree(self.destination_temp_folder, ignore_errors=True)
+    @classmethod
+    def discard_folder(cls, folder: str) -> None:
+        """Move a folder out of the way and delete it in the background.
 
-    @staticmethod
-    def create_temp_folders() -> tuple[str, str]:
-        """Create two temporary folders for source and destination."""
-        source = tempfile.mkdtemp()
-        destination = tempfile.mkdtemp()
-        return source, destination
+        The rename is a single metadata operation on the same filesystem, so the
+        path is gone immediately; the actual removal overlaps with later tests.
+        """
+        trash = f"{folder}.trash.{uuid.uuid4().hex}"
+        try:
+            os.rename(folder, trash)
+        except OSError:
+            trash = folder
+        cls._cleanups.append(cls._cleanup_pool.submit(shutil.rmtree, trash))
+
+    def create_temp_folders(self) -> tuple[str, str]:
+        """Create a temporary source folder and get an empty destination folder.
+
+        The source folder's removal is registered as soon as it exists, so it's cleaned
+        up however the test ends, including when setUp itself fails part way. The
+        destination is this thread's reusable folder, emptied before each test.
+        """
+        source = tempfile.mkdtemp(dir=TEMP_ROOT)
+        self.addCleanup(self.discard_folder, source)
+        return source, self.reusable_destination()
+
+    @classmethod
+    def reusable_destination(cls) -> str:
+        """Return this thread's destination folder, emptied of whatever the last test left in it.
+
+        Reusing the folder saves creating and discarding one per test. Top-level folders
+        are moved out of it and deleted in the background, like discard_folder does, and
+        top-level files are unlinked.
+        """
+        destination = getattr(cls._local, "destination", None)
+        if destination is None:
+            destination = tempfile.mkdtemp(dir=TEMP_ROOT)
+            cls._local.destination = destination
+            with cls._destination_lock:
+                cls._destinations.append(destination)
+            return destination
+
+        with os.scandir(destination) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    os.unlink(entry.path)
+                    continue
+                trash = f"{destination}.trash.{uuid.uuid4().hex}"
+                try:
+                    os.rename(entry.path, trash)
+                except OSError:
+                    # Can't move it aside, so it has to be gone before the next test starts
+                    shutil.rmtree(entry.path)
+                    continue
+                cls._cleanups.append(cls._cleanup_pool.submit(shutil.rmtree, trash))
+        return destination
 
     @staticmethod
-    def create_files_folders(base_path: str, structure: List[Dict[str, Any]]) -> None:
+    def create_files_folders(base_path: str, structure: Structure) -> None:
         """Create a directory and file structure based on the provided specification.
 
         Args:
             base_path: The root directory to create the structure in
-            structure: List of dictionaries specifying files and folders to create
+            structure: FileStructures specifying files and folders to create
         """
-        # First create all directories to ensure parent directories exist
+        # Create each distinct directory once, deepest first; makedirs creates the
+        # parents along the way, so directories already covered are skipped
         print_debug("== BEGIN TEST STRUCTURE ==")
-        for item in structure:
-            full_path = os.path.join(base_path, item["path"])
-            if item.get("is_dir", False):
-                os.makedirs(full_path, exist_ok=True)
-                print_debug(f"mkdir {full_path}")
-            else:
-                os.makedirs(os.path.dirname(full_path), exist_ok=True)
-                print_debug(f"mkdir {os.path.dirname(full_path)}")
-
+        dirs = {
+            os.path.join(base_path, item.path)
+            if item.is_dir
+            else os.path.dirname(os.path.join(base_path, item.path))
+            for item in structure
+        }
+        created = set()
+        for dir_path in sorted(dirs, key=len, reverse=True):
+            if dir_path in created:
+                continue
+            os.makedirs(dir_path, exist_ok=True)
+            print_debug(f"mkdir -p {dir_path}")
+            while dir_path not in created and dir_path != base_path:
+                created.add(dir_path)
+                dir_path = os.path.dirname(dir_path)
 
         # Then create all files
         for item in structure:
-            full_path = os.path.join(base_path, item["path"])
-            if not item.get("is_dir", False):
-                with open(full_path, "w") as f:
-                    f.write(item.get("contents", ""))
-                    print_debug(f"echo '{item.get('contents', '')}' > {full_path}")
+            if item.is_dir:
+                continue
+
+            full_path = os.path.join(base_path, item.path)
+            contents = item.contents
+            fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                # Most fixture files are empty; creating them is enough
+                if contents:
+                    os.write(fd, contents.encode("utf-8"))
+            finally:
+                os.close(fd)
+            print_debug(f"echo '{contents}' > {full_path}")
         print_debug("== END TEST STRUCTURE ==")
 
+    @classmethod
+    def template_for(cls, structure: Structure) -> str:
+        """Return a directory containing the given structure, creating it on first use.
+
+        Structures shared between tests (e.g. BASIC_SOURCE_STRUCTURE) are only
+        materialized once per class; tests copy the template instead.
+        """
+        # FileStructures are frozen, so a structure's tuple is its own cache key
+        key = tuple(structure)
+        with cls._template_lock:
+            template = cls._templates.get(key)
+            if template is None:
+                template = tempfile.mkdtemp(dir=cls._template_dir)
+                cls.create_files_folders(template, structure)
+                cls._templates[key] = template
+        return template
+
     @staticmethod
-    def get_files_folders(directory: str) -> List[Dict[str, Any]]:
-        """Walk a directory and return its structure in our standard format.
+    def get_files_folders(
+        directory: str, needs_contents: Optional[Set[str]] = None
+    ) -> List[FileStructure]:
+        """Walk a directory and return its structure as FileStructures.
 
         Args:
             directory: The directory to analyze
+            needs_contents: If given, only files at these relative paths are read. Any
+                other file is recorded as empty if it is, or as a size placeholder that
+                won't equal any expected contents if it isn't.
 
         Returns:
-            List of dictionaries describing the structure
+            FileStructures describing the structure, sorted by path
         """
         result = []
+        # Every entry path starts with the root plus a separator; slicing that off is
+        # much cheaper than os.path.relpath's normalization
+        prefix_len = len(os.path.join(directory, ""))
+
+        def scan(path: str) -> None:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    rel_path = sys.intern(entry.path[prefix_len:])
 
-        for root, dirs, files in os.walk(directory):
-            # Add all directories (empty or not)
-            for d in dirs:
-                full_path = os.path.join(root, d)
-                rel_path = os.path.relpath(full_path, directory)
-                result.append({"path": rel_path, "is_dir": True})
+                    # Add all directories (empty or not), then descend
+                    if entry.is_dir(follow_symlinks=False):
+                        result.append(FileStructure(rel_path, is_dir=True))
+                        scan(entry.path)
+                        continue
 
-            # Add files
-            for f in files:
-                full_path = os.path.join(root, f)
-                rel_path = os.path.relpath(full_path, directory)
+                    if needs_contents is not None and rel_path not in needs_contents:
+                        size = entry.stat(follow_symlinks=False).st_size
+                        contents = f"<{size} bytes>" if size else ""
+                        result.append(FileStructure(rel_path, contents))
+                        continue
 
-                with open(full_path, "r") as file:
-                    try:
-                        contents = file.read()
-                    except UnicodeDecodeError:
-                        # For binary files, we'll just note their existence without contents
-                        contents = ""
+                    result.append(
+                        FileStructure(rel_path, ROMCopyEngineTest.read_contents(entry.path))
+                    )
 
-                result.append({"path": rel_path, "contents": contents})
+        scan(directory)
 
-        return sorted(result, key=lambda x: x["path"])
+        return sorted(result, key=attrgetter("path"))
 
     @staticmethod
-    def normalize_structure(structure: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Normalize a structure for comparison by handling empty contents consistently."""
-        normalized = []
-        for item in structure:
-            new_item = item.copy()
-            if "contents" not in new_item:
-                new_item["contents"] = ""
-            normalized.append(new_item)
-        return sorted(normalized, key=lambda x: x["path"])
-
-    def assertStructuresEqual(
-        self, expected: List[Dict[str, Any]], actual: List[Dict[str, Any]], msg=None
-    ):
+    def read_contents(path: str) -> str:
+        """Read a file as text, or return an empty string if it's binary."""
+        with open(path, "rb") as file:
+            data = file.read()
+        # Fixture contents are nearly always plain ASCII; try the cheapest codec first
+        try:
+            return data.decode("ascii")
+        except UnicodeDecodeError:
+            try:
+                return data.decode("utf-8")
+            except UnicodeDecodeError:
+                # For binary files, we'll just note their existence without contents
+                return ""
+
+    @staticmethod
+    def read_manifest(
+        manifest_path: str, expected: Structure, directory: str
+    ) -> Optional[List[FileStructure]]:
+        """Load the engine's --emitManifest output as FileStructures.
+
+        The manifest only records a SHA-256 per file, so a file's contents are taken
+        from the expected structure when the hashes match; otherwise the file is read
+        from the directory so a failure shows what the engine actually wrote.
+
+        Args:
+            manifest_path: The manifest written by the engine
+            expected: The structure the test expects, used to resolve file contents
+            directory: The directory the manifest describes
+
+        Returns:
+            FileStructures describing the structure, or None if no manifest was written
+        """
+        try:
+            with open(manifest_path, "rb") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        expected_contents = {item.path: item.contents for item in expected if not item.is_dir}
+
+        result = []
+        for entry in manifest:
+            path = sys.intern(entry["path"])
+            if entry.get("is_dir", False):
+                result.append(FileStructure(path, is_dir=True))
+                continue
+
+            if "sha256" not in entry:
+                # Symlinks and special files are listed by type and never hashed
+                result.append(FileStructure(path, f"<{entry.get('type', 'unknown')}>"))
+                continue
+
+            contents = expected_contents.get(path)
+            if (
+                contents is None
+                or hashlib.sha256(contents.encode("utf-8")).hexdigest() != entry["sha256"]
+            ):
+                actual = ROMCopyEngineTest.read_contents(os.path.join(directory, path))
+                if actual == contents:
+                    # Binary files read as empty; don't let one pass for an empty fixture
+                    actual = f"<{entry.get('size', 0)} bytes, sha256 {entry['sha256']}>"
+                contents = actual
+            result.append(FileStructure(path, contents))
+
+        return result
+
+    @staticmethod
+    def normalize_structure(structure: Structure) -> Dict[str, Tuple[bool, str]]:
+        """Normalize a structure for comparison into a mapping of path -> (is_dir, contents).
+
+        Entry order doesn't matter.
+        """
+        return {item.path: (item.is_dir, item.contents) for item in structure}
+
+    def assertStructuresEqual(self, expected: Structure, actual: Structure, msg=None):
         """Assert that two directory structures are equal and show differences if not.
 
         Args:
@@ -138,63 +670,111 @@ class ROMCopyEngineTest(unittest.TestCase):
         """
         normalized_expected = self.normalize_structure(expected)
         normalized_actual = self.normalize_structure(actual)
+        if normalized_expected == normalized_actual:
+            return
+
+        # Only work out what differs when there's a failure to report
+        missing = sorted(normalized_expected.keys() - normalized_actual.keys())
+        unexpected = sorted(normalized_actual.keys() - normalized_expected.keys())
+        different = sorted(
+            path
+            for path in normalized_expected.keys() & normalized_actual.keys()
+            if normalized_expected[path] != normalized_actual[path]
+        )
 
-        expected_json = json.dumps(normalized_expected, sort_keys=True, indent=2)
-        actual_json = json.dumps(normalized_actual, sort_keys=True, indent=2)
-
-        if expected_json != actual_json:
-            diff = "".join(
-                difflib.unified_diff(
-                    expected_json.splitlines(keepends=True),
-                    actual_json.splitlines(keepends=True),
-                    fromfile="expected",
-                    tofile="actual",
-                )
-            )
-            self.fail(f"Structures differ:\n{diff}")
+        def describe(path: str, entry: Tuple[bool, str]) -> str:
+            is_dir, contents = entry
+            return f"  [DIR] {path}" if is_dir else f"  {path} :: {contents!r}"
+
+        lines = [
+            f"Structures differ: {len(missing)} expected entries missing, "
+            f"{len(unexpected)} unexpected, {len(different)} different"
+        ]
+        if missing:
+            lines.append("Missing:")
+            lines.extend(describe(path, normalized_expected[path]) for path in missing)
+        if unexpected:
+            lines.append("Unexpected:")
+            lines.extend(describe(path, normalized_actual[path]) for path in unexpected)
+        if different:
+            lines.append("Different (expected, then actual):")
+            for path in different:
+                lines.append(describe(path, normalized_expected[path]))
+                lines.append(describe(path, normalized_actual[path]))
+        self.fail("\n".join(lines))
 
     def execute_rom_copy_engine(
-        self, source_dir: str, target_dir: str, options: str = ""
+        self,
+        source_dir: str,
+        target_dir: str,
+        options: Tuple[str, ...] = (),
+        manifest_path: Optional[str] = None,
     ) -> subprocess.CompletedProcess:
         """Execute the ROMCopyEngine with given parameters.
 
+        The invocation is sent as a job to this thread's engine server rather than
+        starting a new process for every test.
+
         Args:
             source_dir: Source directory path
             target_dir: Target directory path
-            options: Additional command line options as a string
+            options: Additional command line arguments, one per element
+            manifest_path: If given, have the engine write a manifest of target_dir here
 
         Returns:
-            CompletedProcess instance with return code and output
+            CompletedProcess instance for the server process with the job's return code;
+            stdout and stderr (as bytes) are only filled in if the engine failed
         """
-        command = [
-            "go",
-            "run",
-            "ROMCopyEngine.go",
-            "--skipConfirm",
-            "--sourceDir",
-            source_dir,
-            "--targetDir",
-            target_dir,
-        ]
+        args = ["--skipConfirm", *options]
+
+        if manifest_path:
+            args.extend(["--emitManifest", manifest_path])
+
+        server = self.engine_server()
+        request = json.dumps({"source": source_dir, "target": target_dir, "args": args})
+        print_debug(f"Sending job to `{shlex.join(server.args)}`: {request}")
+        try:
+            server.stdin.write(request.encode() + b"\n")
+            server.stdin.flush()
+            line = server.stdout.readline()
+        except OSError:
+            line = b""
+        if not line:
+            raise RuntimeError(
+                f"ROMCopyEngine server exited unexpectedly (code {server.wait()})"
+            )
 
-        if options:
-            command.extend(options.split())
+        # Output is only kept (and decoded by the caller) if the engine failed
+        response = json.loads(line)
+        job = subprocess.CompletedProcess(server.args, response["code"])
+        if job.returncode != 0:
+            job.stdout = response["stdout"].encode()
+            job.stderr = response["stderr"].encode()
 
-        print_debug(f"Executing `{' '.join(command)}`")
+        return job
 
-        job = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."),
-        )
+    def execute_rom_copy_engine_directly(
+        self, source_dir: str, target_dir: str, options: Tuple[str, ...] = ()
+    ) -> subprocess.CompletedProcess:
+        """Execute the ROMCopyEngine binary as its own process, bypassing the server.
 
-        # print(' '.join(command))
-        # print(job.stdout)
+        Args:
+            source_dir: Source directory path
+            target_dir: Target directory path
+            options: Additional command line arguments, one per element
 
-        # import time
-        # time.sleep(9999999)
-        return job
+        Returns:
+            CompletedProcess instance with stdout and stderr decoded as text
+        """
+        command = [
+            self._bin,
+            "--skipConfirm",
+            "--sourceDir", source_dir,
+            "--targetDir", target_dir,
+            *options,
+        ]
+        print_debug(f"Running `{shlex.join(command)}`")
+        return subprocess.run(command, capture_output=True, text=True, cwd=REPO_ROOT)
 
     def run_copy_test(self, fixture: TestFixture) -> None:
         """Run a copy test with given test fixture.
@@ -205,484 +785,445 @@ class ROMCopyEngineTest(unittest.TestCase):
         # Create initial file structures
         print_debug(f"mkdir {self.source_temp_folder}")
         print_debug(f"mkdir {self.destination_temp_folder}")
-        self.create_files_folders(self.source_temp_folder, fixture.source_struct)
-        self.create_files_folders(self.destination_temp_folder, fixture.dest_struct)
+        # The engine only ever reads the source, so it can share the template's files;
+        # destination files get truncated and rewritten in place, so those are copied
+        shutil.copytree(
+            self.template_for(fixture.source_struct),
+            self.source_temp_folder,
+            copy_function=link_file,
+            dirs_exist_ok=True,
+        )
+        shutil.copytree(
+            self.template_for(fixture.dest_struct),
+            self.destination_temp_folder,
+            copy_function=clone_file,
+            dirs_exist_ok=True,
+        )
 
         # Run the copy engine
         result = self.execute_rom_copy_engine(
-            self.source_temp_folder, self.destination_temp_folder, fixture.options
-        )
-        self.assertEqual(
-            result.returncode,
-            0,
-            f"ROMCopyEngine failed with exit code {result.returncode}:\n{result.stderr}",
+            self.source_temp_folder,
+            self.destination_temp_folder,
+            fixture.options,
+            manifest_path=self.manifest_path,
         )
+        if result.returncode != 0:
+            self.fail(
+                f"ROMCopyEngine failed with exit code {result.returncode}:\n"
+                f"{result.stdout.decode(errors='replace')}\n"
+                f"{result.stderr.decode(errors='replace')}"
+            )
 
-        # Get actual structure and compare
-        actual_destination_file_folder_struct = self.get_files_folders(
-            self.destination_temp_folder
+        # Get actual structure from the engine's manifest, walking the tree ourselves
+        # if the engine didn't write one
+        actual_destination_file_folder_struct = self.read_manifest(
+            self.manifest_path, fixture.expected_struct, self.destination_temp_folder
         )
+        if actual_destination_file_folder_struct is None:
+            # Only files expected to have contents need reading
+            needs_contents = {item.path for item in fixture.expected_struct if item.contents}
+            actual_destination_file_folder_struct = self.get_files_folders(
+                self.destination_temp_folder, needs_contents
+            )
         self.assertStructuresEqual(
-            fixture.expected_struct, actual_destination_file_folder_struct
+            fixture.expected_struct,
+            actual_destination_file_folder_struct,
         )
 
-    # Common test structures
-    BASIC_SOURCE_STRUCTURE = [
-        {"path": "snes/file1.snes"},
-        {"path": "snes/file2.snes"},
-        {"path": "snes/nested_dir/image.png"},
-        {"path": "snes/file.xml", "contents": "<xml>foo</xml>"},
-        {"path": "nes", "is_dir": True},
-        {"path": "psx/game1.bin"},
-        {"path": "psx/game2.bin"},
-        {"path": "psx/multidisk/game3_disk1.bin"},
-        {"path": "psx/multidisk/game3_disk2.bin"},
-        {
-            "path": "psx/multidisk/game3.m3u",
-            "contents": "./multidisk/game3_disk1.bin\n./multidisk/game3_disk2.bin",
-        },
-        {"path": "psx/images/game1.png"},
-        {"path": "psx/images/game2.png"},
-        {
-            "path": "psx/gameslist.xml",
-            "contents": "<game>\n  <path>game1.bin</path>\n  <image>../psx/images/game1.png</image>\n</game>",
-        },
-    ]
-
-    EMPTY_DESTINATION = [
-        {"path": "snes", "is_dir": True},
-        {"path": "PS1", "is_dir": True},
-    ]
+    # Expected results for tests built on BASIC_SOURCE_STRUCTURE
+    PS1_GAMES_EXPECTED = (
+        FileStructure("PS1", is_dir=True),
+        FileStructure("PS1/game1.bin"),
+        FileStructure("PS1/game2.bin"),
+        FileStructure("PS1/images", is_dir=True),
+        FileStructure("PS1/images/game1.png"),
+        FileStructure("PS1/images/game2.png"),
+        FileStructure("PS1/multidisk", is_dir=True),
+        FileStructure("PS1/multidisk/game3_disk1.bin"),
+        FileStructure("PS1/multidisk/game3_disk2.bin"),
+        FileStructure(
+            "PS1/multidisk/game3.m3u",
+            contents="./multidisk/game3_disk1.bin\n./multidisk/game3_disk2.bin",
+        ),
+    )
+
+    EXPECTED_CLEAN_TARGET = PS1_GAMES_EXPECTED + (
+        FileStructure(
+            "PS1/gameslist.xml",
+            contents="<game>\n  <path>game1.bin</path>\n  <image>../psx/images/game1.png</image>\n</game>",
+        ),
+    )
+
+    EXPECTED_MULTIPLE_MAPPINGS = EXPECTED_CLEAN_TARGET + SNES_COPY_EXPECTED
+
+    EXPECTED_RENAME_FILES = PS1_GAMES_EXPECTED + (
+        FileStructure(
+            "PS1/miyoogamelist.xml",
+            contents="<game>\n  <path>game1.bin</path>\n  <image>../psx/images/game1.png</image>\n</game>",
+        ),
+        FileStructure("snes", is_dir=True),
+    )
+
+    EXPECTED_EXPLODE_DIR = (
+        FileStructure("PS1", is_dir=True),
+        FileStructure("PS1/game1.bin"),
+        FileStructure("PS1/game2.bin"),
+        FileStructure("PS1/game3_disk1.bin"),
+        FileStructure("PS1/game3_disk2.bin"),
+        FileStructure("PS1/game3.m3u", contents="./game3_disk1.bin\n./game3_disk2.bin"),
+        FileStructure("PS1/game1.png"),
+        FileStructure("PS1/game2.png"),
+        FileStructure(
+            "PS1/gameslist.xml",
+            contents="<game>\n  <path>game1.bin</path>\n  <image>./game1.png</image>\n</game>",
+        ),
+        FileStructure("snes", is_dir=True),
+    )
+
+    EXPECTED_COPY_INCLUDE = (
+        FileStructure("PS1", is_dir=True),
+        FileStructure("PS1/images", is_dir=True),
+        FileStructure("PS1/images/game1.png"),
+        FileStructure("PS1/images/game2.png"),
+        FileStructure("snes", is_dir=True),
+    )
+
+    # Fixtures used by a single test
+    SOURCE_COPY_EXCLUDE = (
+        FileStructure("snes/file1.snes"),
+        FileStructure("snes/file2.snes"),
+        FileStructure("snes/nested_dir/image.png"),
+        FileStructure("snes/img.png"),
+        FileStructure("snes/png.not"),
+        FileStructure("nes", is_dir=True),
+    )
+
+    EXPECTED_COPY_EXCLUDE = (
+        FileStructure("snes", is_dir=True),
+        FileStructure("snes/img.png"),
+        FileStructure("snes/nested_dir", is_dir=True),
+        FileStructure("snes/nested_dir/image.png"),
+    )
+
+    DESTINATION_CLEAN_TARGET = (
+        FileStructure("PS1", is_dir=True),
+        FileStructure("PS1/old_file.bin"),
+        FileStructure("PS1/should_be_removed.txt"),
+    )
+
+    SOURCE_EMPTY_DIRECTORIES = (
+        FileStructure("snes/empty1", is_dir=True),
+        FileStructure("snes/empty2", is_dir=True),
+        FileStructure("snes/nonempty", is_dir=True),
+        FileStructure("snes/nonempty/file.txt", contents="test"),
+        FileStructure("psx/empty3", is_dir=True),
+    )
+
+    DESTINATION_EMPTY_DIRECTORIES = (
+        FileStructure("snes", is_dir=True),
+        FileStructure("PS1", is_dir=True),
+        FileStructure("PS1/existing_empty", is_dir=True),
+    )
+
+    EXPECTED_EMPTY_DIRECTORIES = (
+        FileStructure("snes", is_dir=True),
+        FileStructure("snes/empty1", is_dir=True),
+        FileStructure("snes/empty2", is_dir=True),
+        FileStructure("snes/nonempty", is_dir=True),
+        FileStructure("snes/nonempty/file.txt", contents="test"),
+        FileStructure("PS1", is_dir=True),
+        FileStructure("PS1/empty3", is_dir=True),
+        FileStructure("PS1/existing_empty", is_dir=True),
+    )
+
+    SOURCE_FILE_REWRITE = (
+        FileStructure(
+            "psx/playlist.m3u",
+            contents="./multidisk/game1.bin\n./multidisk/game2.bin",
+        ),
+        FileStructure(
+            "psx/info.xml",
+            contents="<game>\n  <image>../psx/images/game.png</image>\n</game>",
+        ),
+    )
+
+    EXPECTED_FILE_REWRITE = (
+        FileStructure("PS1", is_dir=True),
+        FileStructure(
+            "PS1/info.xml",
+            contents="<game>\n  <image>./game.png</image>\n</game>",
+        ),
+        FileStructure("PS1/playlist.m3u", contents="./game1.bin\n./game2.bin"),
+    )
+
+    SOURCE_SIMPLE_FILE_REWRITE = (
+        FileStructure("psx/playlist.txt", contents="OLDTEXT\nOLDTEXT"),
+    )
+
+    EXPECTED_SIMPLE_FILE_REWRITE = (
+        FileStructure("PS1", is_dir=True),
+        FileStructure("PS1/playlist.txt", contents="NEWTEXT\nNEWTEXT"),
+    )
+
+    SOURCE_COMBINED_INCLUDE_EXCLUDE = (
+        FileStructure("snes/file1.snes"),
+        FileStructure("snes/file2.snes"),
+        FileStructure("snes/good.png"),
+        FileStructure("snes/bad.png"),
+        FileStructure("snes/nested_dir/good.png"),
+        FileStructure("snes/nested_dir/bad.png"),
+        FileStructure("snes/nested_dir/test.txt"),
+    )
+
+    # Should only include PNGs that don't have 'bad' in the name
+    EXPECTED_COMBINED_INCLUDE_EXCLUDE = (
+        FileStructure("snes", is_dir=True),
+        FileStructure("snes/good.png"),
+        FileStructure("snes/nested_dir", is_dir=True),
+        FileStructure("snes/nested_dir/good.png"),
+    )
+
+    SOURCE_DRY_RUN = (
+        FileStructure("snes/file1.snes"),
+        FileStructure("snes/file2.snes"),
+    )
+
+    # With --dryRun, destination should remain unchanged
+    DESTINATION_DRY_RUN = (
+        FileStructure("snes", is_dir=True),
+        FileStructure("snes/existing.txt", contents="should remain"),
+    )
+
+    SOURCE_MULTIPLE_RENAMES = (
+        FileStructure("snes/gameslist.xml", contents="<xml>test</xml>"),
+        FileStructure("snes/images/game.png"),
+        FileStructure("snes/saves/save.sav"),
+    )
+
+    # Should rename both the XML file and the folders
+    EXPECTED_MULTIPLE_RENAMES = (
+        FileStructure("snes", is_dir=True),
+        FileStructure("snes/miyoogamelist.xml", contents="<xml>test</xml>"),
+        FileStructure("snes/Imgs", is_dir=True),
+        FileStructure("snes/Imgs/game.png"),
+        FileStructure("snes/SaveData", is_dir=True),
+        FileStructure("snes/SaveData/save.sav"),
+    )
 
     def test_basic_copy(self):
         """Test a basic copy operation with the example from the documentation."""
         fixture = TestFixture(
-            source_struct=[
-                {"path": "snes/file1.snes"},
-                {"path": "snes/file2.snes"},
-                {"path": "snes/nested_dir/image.png"},
-                {"path": "snes/file.xml", "contents": "<xml>foo</xml>"},
-                {"path": "nes", "is_dir": True},
-            ],
-            dest_struct=[{"path": "snes", "is_dir": True}],
-            expected_struct=[
-                {"path": "snes", "is_dir": True},
-                {"path": "snes/file1.snes"},
-                {"path": "snes/file2.snes"},
-                {"path": "snes/file.xml", "contents": "<xml>foo</xml>"},
-                {"path": "snes/nested_dir", "is_dir": True},
-                {"path": "snes/nested_dir/image.png"},
-            ],
-            options="--mapping snes:snes --skipConfirm"
+            source_struct=SNES_SOURCE_STRUCTURE,
+            dest_struct=SNES_DESTINATION,
+            expected_struct=SNES_COPY_EXPECTED,
+            options=("--mapping", "snes:snes", "--skipConfirm")
         )
         self.run_copy_test(fixture)
 
     def test_basic_copy_with_stray_injected_file(self):
         """Test that stray files in the destination are preserved."""
-        source_file_folder_struct = [
-            {"path": "snes/file1.snes"},
-            {"path": "snes/file2.snes"},
-            {"path": "snes/nested_dir/image.png"},
-            {"path": "snes/file.xml", "contents": "<xml>foo</xml>"},
-            {"path": "nes", "is_dir": True},
-        ]
-
-        destination_file_folder_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/not_belong.snes"},
-        ]
-
-        expected_destination_file_folder_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/file1.snes"},
-            {"path": "snes/file2.snes"},
-            {"path": "snes/file.xml", "contents": "<xml>foo</xml>"},
-            {"path": "snes/nested_dir", "is_dir": True},
-            {"path": "snes/nested_dir/image.png"},
-            {"path": "snes/not_belong.snes"},
-        ]
+        stray_file = FileStructure("snes/not_belong.snes")
 
         self.run_copy_test(
             TestFixture(
-                source_struct=source_file_folder_struct,
-                dest_struct=destination_file_folder_struct,
-                expected_struct=expected_destination_file_folder_struct,
-                options="--mapping snes:snes --skipConfirm",
+                source_struct=SNES_SOURCE_STRUCTURE,
+                dest_struct=SNES_DESTINATION + (stray_file,),
+                expected_struct=SNES_COPY_EXPECTED + (stray_file,),
+                options=("--mapping", "snes:snes", "--skipConfirm"),
             )
         )
 
     def test_multiple_mappings(self):
         """Test that multiple platform mappings work correctly."""
-        expected_structure = [
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/game1.bin"},
-            {"path": "PS1/game2.bin"},
-            {"path": "PS1/images", "is_dir": True},
-            {"path": "PS1/images/game1.png"},
-            {"path": "PS1/images/game2.png"},
-            {"path": "PS1/multidisk", "is_dir": True},
-            {"path": "PS1/multidisk/game3_disk1.bin"},
-            {"path": "PS1/multidisk/game3_disk2.bin"},
-            {
-                "path": "PS1/multidisk/game3.m3u",
-                "contents": "./multidisk/game3_disk1.bin\n./multidisk/game3_disk2.bin",
-            },
-            {
-                "path": "PS1/gameslist.xml",
-                "contents": "<game>\n  <path>game1.bin</path>\n  <image>../psx/images/game1.png</image>\n</game>",
-            },
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/file1.snes"},
-            {"path": "snes/file2.snes"},
-            {"path": "snes/file.xml", "contents": "<xml>foo</xml>"},
-            {"path": "snes/nested_dir", "is_dir": True},
-            {"path": "snes/nested_dir/image.png"},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=self.BASIC_SOURCE_STRUCTURE,
-                dest_struct=self.EMPTY_DESTINATION,
-                expected_struct=expected_structure,
-                options="--mapping snes:snes --mapping psx:PS1",
+                source_struct=BASIC_SOURCE_STRUCTURE,
+                dest_struct=EMPTY_DESTINATION,
+                expected_struct=self.EXPECTED_MULTIPLE_MAPPINGS,
+                options=("--mapping", "snes:snes", "--mapping", "psx:PS1"),
             )
         )
 
     def test_copy_exclude(self):
         """Test that --copyExclude flag works correctly."""
-        source_file_folder_struct = [
-            {"path": "snes/file1.snes"},
-            {"path": "snes/file2.snes"},
-            {"path": "snes/nested_dir/image.png"},
-            {"path": "snes/img.png"},
-            {"path": "snes/png.not"},
-            {"path": "nes", "is_dir": True},
-        ]
-
-        destination_file_folder_struct = [
-            {"path": "snes", "is_dir": True},
-        ]
-
-        expected_destination_file_folder_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/img.png"},
-            {"path": "snes/nested_dir", "is_dir": True},
-            {"path": "snes/nested_dir/image.png"},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=source_file_folder_struct,
-                dest_struct=destination_file_folder_struct,
-                expected_struct=expected_destination_file_folder_struct,
-                options="--mapping snes:snes --copyInclude **/*.png --skipConfirm",
+                source_struct=self.SOURCE_COPY_EXCLUDE,
+                dest_struct=SNES_DESTINATION,
+                expected_struct=self.EXPECTED_COPY_EXCLUDE,
+                options=("--mapping", "snes:snes", "--copyInclude", "**/*.png", "--skipConfirm"),
             )
         )
 
     def test_explode_dir(self):
         """Test that --explodeDir moves files from subdirectories to parent directory."""
-        expected_structure = [
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/game1.bin"},
-            {"path": "PS1/game2.bin"},
-            {"path": "PS1/game3_disk1.bin"},
-            {"path": "PS1/game3_disk2.bin"},
-            {
-                "path": "PS1/game3.m3u",
-                "contents": "./game3_disk1.bin\n./game3_disk2.bin",
-            },
-            {"path": "PS1/game1.png"},
-            {"path": "PS1/game2.png"},
-            {
-                "path": "PS1/gameslist.xml",
-                "contents": "<game>\n  <path>game1.bin</path>\n  <image>./game1.png</image>\n</game>",
-            },
-            {"path": "snes", "is_dir": True},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=self.BASIC_SOURCE_STRUCTURE,
-                dest_struct=self.EMPTY_DESTINATION,
-                expected_struct=expected_structure,
-                options="--mapping psx:PS1 --explodeDir multidisk --explodeDir images --rewrite *.m3u:./multidisk/:./ --rewrite *.xml:../psx/images/:./ --rewritesAreRegex",
+                source_struct=BASIC_SOURCE_STRUCTURE,
+                dest_struct=EMPTY_DESTINATION,
+                expected_struct=self.EXPECTED_EXPLODE_DIR,
+                options=(
+                    "--mapping", "psx:PS1",
+                    "--explodeDir", "multidisk",
+                    "--explodeDir", "images",
+                    "--rewrite", "*.m3u:./multidisk/:./",
+                    "--rewrite", "*.xml:../psx/images/:./",
+                    "--rewritesAreRegex",
+                ),
             )
         )
 
     def test_rename_files(self):
         """Test that --rename flag works correctly for files."""
-        expected_structure = [
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/game1.bin"},
-            {"path": "PS1/game2.bin"},
-            {"path": "PS1/images", "is_dir": True},
-            {"path": "PS1/images/game1.png"},
-            {"path": "PS1/images/game2.png"},
-            {"path": "PS1/multidisk", "is_dir": True},
-            {"path": "PS1/multidisk/game3_disk1.bin"},
-            {"path": "PS1/multidisk/game3_disk2.bin"},
-            {
-                "path": "PS1/multidisk/game3.m3u",
-                "contents": "./multidisk/game3_disk1.bin\n./multidisk/game3_disk2.bin",
-            },
-            {
-                "path": "PS1/miyoogamelist.xml",
-                "contents": "<game>\n  <path>game1.bin</path>\n  <image>../psx/images/game1.png</image>\n</game>",
-            },
-            {"path": "snes", "is_dir": True},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=self.BASIC_SOURCE_STRUCTURE,
-                dest_struct=self.EMPTY_DESTINATION,
-                expected_struct=expected_structure,
-                options="--mapping psx:PS1 --rename gameslist.xml:miyoogamelist.xml",
+                source_struct=BASIC_SOURCE_STRUCTURE,
+                dest_struct=EMPTY_DESTINATION,
+                expected_struct=self.EXPECTED_RENAME_FILES,
+                options=("--mapping", "psx:PS1", "--rename", "gameslist.xml:miyoogamelist.xml"),
             )
         )
 
     def test_clean_target(self):
         """Test that --cleanTarget removes existing files in target directory."""
-        destination_with_files = [
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/old_file.bin"},
-            {"path": "PS1/should_be_removed.txt"},
-        ]
-
-        expected_structure = [
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/game1.bin"},
-            {"path": "PS1/game2.bin"},
-            {"path": "PS1/images", "is_dir": True},
-            {"path": "PS1/images/game1.png"},
-            {"path": "PS1/images/game2.png"},
-            {"path": "PS1/multidisk", "is_dir": True},
-            {"path": "PS1/multidisk/game3_disk1.bin"},
-            {"path": "PS1/multidisk/game3_disk2.bin"},
-            {
-                "path": "PS1/multidisk/game3.m3u",
-                "contents": "./multidisk/game3_disk1.bin\n./multidisk/game3_disk2.bin",
-            },
-            {
-                "path": "PS1/gameslist.xml",
-                "contents": "<game>\n  <path>game1.bin</path>\n  <image>../psx/images/game1.png</image>\n</game>",
-            },
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=self.BASIC_SOURCE_STRUCTURE,
-                dest_struct=destination_with_files,
-                expected_struct=expected_structure,
-                options="--mapping psx:PS1 --cleanTarget",
+                source_struct=BASIC_SOURCE_STRUCTURE,
+                dest_struct=self.DESTINATION_CLEAN_TARGET,
+                expected_struct=self.EXPECTED_CLEAN_TARGET,
+                options=("--mapping", "psx:PS1", "--cleanTarget"),
             )
         )
 
     def test_empty_directory_handling(self):
         """Test that empty directories are properly created and preserved."""
-        source_struct = [
-            {"path": "snes/empty1", "is_dir": True},
-            {"path": "snes/empty2", "is_dir": True},
-            {"path": "snes/nonempty", "is_dir": True},
-            {"path": "snes/nonempty/file.txt", "contents": "test"},
-            {"path": "psx/empty3", "is_dir": True},
-        ]
-
-        destination_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/existing_empty", "is_dir": True},
-        ]
-
-        expected_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/empty1", "is_dir": True},
-            {"path": "snes/empty2", "is_dir": True},
-            {"path": "snes/nonempty", "is_dir": True},
-            {"path": "snes/nonempty/file.txt", "contents": "test"},
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/empty3", "is_dir": True},
-            {"path": "PS1/existing_empty", "is_dir": True},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=source_struct,
-                dest_struct=destination_struct,
-                expected_struct=expected_struct,
-                options="--mapping snes:snes --mapping psx:PS1",
+                source_struct=self.SOURCE_EMPTY_DIRECTORIES,
+                dest_struct=self.DESTINATION_EMPTY_DIRECTORIES,
+                expected_struct=self.EXPECTED_EMPTY_DIRECTORIES,
+                options=("--mapping", "snes:snes", "--mapping", "psx:PS1"),
             )
         )
 
     def test_copy_include(self):
         """Test that --copyInclude flag works correctly."""
-        expected_structure = [
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/images", "is_dir": True},
-            {"path": "PS1/images/game1.png"},
-            {"path": "PS1/images/game2.png"},
-            {"path": "snes", "is_dir": True},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=self.BASIC_SOURCE_STRUCTURE,
-                dest_struct=self.EMPTY_DESTINATION,
-                expected_struct=expected_structure,
-                options="--mapping psx:PS1 --copyInclude **/*.png",
+                source_struct=BASIC_SOURCE_STRUCTURE,
+                dest_struct=EMPTY_DESTINATION,
+                expected_struct=self.EXPECTED_COPY_INCLUDE,
+                options=("--mapping", "psx:PS1", "--copyInclude", "**/*.png"),
             )
         )
 
     def test_file_rewrite(self):
         """Test that file content rewriting works correctly."""
-        source_struct = [
-            {
-                "path": "psx/playlist.m3u",
-                "contents": "./multidisk/game1.bin\n./multidisk/game2.bin",
-            },
-            {
-                "path": "psx/info.xml",
-                "contents": "<game>\n  <image>../psx/images/game.png</image>\n</game>",
-            },
-        ]
-
-        destination_struct = [
-            {"path": "PS1", "is_dir": True},
-        ]
-
-        expected_struct = [
-            {"path": "PS1", "is_dir": True},
-            {
-                "path": "PS1/info.xml",
-                "contents": "<game>\n  <image>./game.png</image>\n</game>",
-            },
-            {"path": "PS1/playlist.m3u", "contents": "./game1.bin\n./game2.bin"},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=source_struct,
-                dest_struct=destination_struct,
-                expected_struct=expected_struct,
-                options="--mapping psx:PS1 --rewrite *.m3u:./multidisk/:./ --rewrite *.xml:../psx/images/:./ --rewritesAreRegex",
+                source_struct=self.SOURCE_FILE_REWRITE,
+                dest_struct=PS1_DESTINATION,
+                expected_struct=self.EXPECTED_FILE_REWRITE,
+                options=(
+                    "--mapping", "psx:PS1",
+                    "--rewrite", "*.m3u:./multidisk/:./",
+                    "--rewrite", "*.xml:../psx/images/:./",
+                    "--rewritesAreRegex",
+                ),
             )
         )
 
     def test_simple_file_rewrite(self):
         """Test file content rewriting with simple patterns."""
-        source_struct = [
-            {"path": "psx/playlist.txt", "contents": "OLDTEXT\nOLDTEXT"},
-        ]
-
-        destination_struct = [
-            {"path": "PS1", "is_dir": True},
-        ]
-
-        expected_struct = [
-            {"path": "PS1", "is_dir": True},
-            {"path": "PS1/playlist.txt", "contents": "NEWTEXT\nNEWTEXT"},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=source_struct,
-                dest_struct=destination_struct,
-                expected_struct=expected_struct,
-                options="--mapping psx:PS1 --rewrite *.txt:OLDTEXT:NEWTEXT",
+                source_struct=self.SOURCE_SIMPLE_FILE_REWRITE,
+                dest_struct=PS1_DESTINATION,
+                expected_struct=self.EXPECTED_SIMPLE_FILE_REWRITE,
+                options=("--mapping", "psx:PS1", "--rewrite", "*.txt:OLDTEXT:NEWTEXT"),
             )
         )
 
     def test_combined_include_exclude(self):
         """Test that --copyInclude and --copyExclude flags work together correctly."""
-        source_struct = [
-            {"path": "snes/file1.snes"},
-            {"path": "snes/file2.snes"},
-            {"path": "snes/good.png"},
-            {"path": "snes/bad.png"},
-            {"path": "snes/nested_dir/good.png"},
-            {"path": "snes/nested_dir/bad.png"},
-            {"path": "snes/nested_dir/test.txt"},
-        ]
-
-        destination_struct = [
-            {"path": "snes", "is_dir": True},
-        ]
-
-        # Should only include PNGs that don't have 'bad' in the name
-        expected_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/good.png"},
-            {"path": "snes/nested_dir", "is_dir": True},
-            {"path": "snes/nested_dir/good.png"},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=source_struct,
-                dest_struct=destination_struct,
-                expected_struct=expected_struct,
-                options="--mapping snes:snes --copyInclude **/*.png --copyExclude **/bad*",
+                source_struct=self.SOURCE_COMBINED_INCLUDE_EXCLUDE,
+                dest_struct=SNES_DESTINATION,
+                expected_struct=self.EXPECTED_COMBINED_INCLUDE_EXCLUDE,
+                options=(
+                    "--mapping", "snes:snes",
+                    "--copyInclude", "**/*.png",
+                    "--copyExclude", "**/bad*",
+                ),
             )
         )
 
     def test_dry_run(self):
         """Test that --dryRun flag prevents any actual file operations."""
-        source_struct = [
-            {"path": "snes/file1.snes"},
-            {"path": "snes/file2.snes"},
-        ]
-
-        destination_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/existing.txt", "contents": "should remain"},
-        ]
-
-        # With --dryRun, destination should remain unchanged
-        expected_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/existing.txt", "contents": "should remain"},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=source_struct,
-                dest_struct=destination_struct,
-                expected_struct=expected_struct,
-                options="--mapping snes:snes --dryRun",
+                source_struct=self.SOURCE_DRY_RUN,
+                dest_struct=self.DESTINATION_DRY_RUN,
+                expected_struct=self.DESTINATION_DRY_RUN,
+                options=("--mapping", "snes:snes", "--dryRun"),
             )
         )
 
     def test_multiple_renames(self):
         """Test that multiple --rename operations work correctly together."""
-        source_struct = [
-            {"path": "snes/gameslist.xml", "contents": "<xml>test</xml>"},
-            {"path": "snes/images/game.png"},
-            {"path": "snes/saves/save.sav"},
-        ]
-
-        destination_struct = [
-            {"path": "snes", "is_dir": True},
-        ]
-
-        # Should rename both the XML file and the folders
-        expected_struct = [
-            {"path": "snes", "is_dir": True},
-            {"path": "snes/miyoogamelist.xml", "contents": "<xml>test</xml>"},
-            {"path": "snes/Imgs", "is_dir": True},
-            {"path": "snes/Imgs/game.png"},
-            {"path": "snes/SaveData", "is_dir": True},
-            {"path": "snes/SaveData/save.sav"},
-        ]
-
         self.run_copy_test(
             TestFixture(
-                source_struct=source_struct,
-                dest_struct=destination_struct,
-                expected_struct=expected_struct,
-                options="--mapping snes:snes --rename gameslist.xml:miyoogamelist.xml --rename images:Imgs --rename saves:SaveData",
+                source_struct=self.SOURCE_MULTIPLE_RENAMES,
+                dest_struct=SNES_DESTINATION,
+                expected_struct=self.EXPECTED_MULTIPLE_RENAMES,
+                options=(
+                    "--mapping", "snes:snes",
+                    "--rename", "gameslist.xml:miyoogamelist.xml",
+                    "--rename", "images:Imgs",
+                    "--rename", "saves:SaveData",
+                ),
             )
         )
 
+    def test_direct_invocation(self):
+        """Test a copy run as its own process, through the normal command line entry point."""
+        self.create_files_folders(self.source_temp_folder, SNES_SOURCE_STRUCTURE)
+        self.create_files_folders(self.destination_temp_folder, SNES_DESTINATION)
+
+        result = self.execute_rom_copy_engine_directly(
+            self.source_temp_folder,
+            self.destination_temp_folder,
+            ("--mapping", "snes:snes"),
+        )
+
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertIn("All transfers & processing completed successfully!", result.stdout)
+        self.assertStructuresEqual(
+            SNES_COPY_EXPECTED,
+            self.get_files_folders(self.destination_temp_folder),
+        )
+
+    def test_direct_invocation_missing_mapping(self):
+        """Test that a missing mapping source directory makes the process exit nonzero."""
+        self.create_files_folders(self.source_temp_folder, SNES_SOURCE_STRUCTURE)
+        self.create_files_folders(self.destination_temp_folder, EMPTY_DESTINATION)
+
+        result = self.execute_rom_copy_engine_directly(
+            self.source_temp_folder,
+            self.destination_temp_folder,
+            ("--mapping", "psx:PS1"),
+        )
+
+        self.assertEqual(result.returncode, 1, result.stdout + result.stderr)
+        self.assertIn("source mapping directory does not exist", result.stdout)
+        self.assertStructuresEqual(
+            EMPTY_DESTINATION,
+            self.get_files_folders(self.destination_temp_folder),
+        )
+
 
 if __name__ == "__main__":
-    unittest.main()
+    loader = unittest.TestLoader()
+    loader.suiteClass = ConcurrentTestSuite
+    unittest.main(testLoader=loader)